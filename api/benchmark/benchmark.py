@@ -1,16 +1,65 @@
 import asyncio
 import aiohttp
+import functools
+import itertools
+import numpy as np
 import time
-import statistics
 import json
-from typing import List, Dict
-import argparse
+import math
+import operator
+import sys
+from collections import Counter
+from typing import List, Dict, Optional
+import dataclasses
 from dataclasses import dataclass
 from datetime import datetime
-import random
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib json module
+    orjson = None
 
-@dataclass
+try:
+    from hdrh.histogram import HdrHistogram
+except ImportError:  # optional: --streaming-stats falls back to a Counter
+    HdrHistogram = None
+
+# HTTP verb -> aiohttp.ClientSession method name, resolved once per endpoint
+HTTP_METHODS = {"GET": "get", "POST": "post", "PUT": "put", "DELETE": "delete"}
+
+# Column order of the per-server RPS matrix used to pick winners
+SERVER_NAMES = ("FastAPI", "Rust", "Node.js")
+
+# Endpoint/method sets used to group comparisons into report categories
+BASIC_ENDPOINTS = frozenset(("/", "/health"))
+WRITE_METHODS = frozenset(("POST", "PUT", "DELETE"))
+
+# Responses larger than this are drained in chunks instead of read() whole
+DRAIN_CHUNK_SIZE = 64 * 1024
+
+
+def encode_json(obj) -> bytes:
+    """Encode a JSON payload, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def dumps_json(obj) -> str:
+    """aiohttp json_serialize hook; aiohttp expects a str, not bytes"""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def decode_json(raw: bytes):
+    """Decode a JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@dataclass(slots=True, frozen=True)
 class BenchmarkResult:
     endpoint: str
     method: str
@@ -24,9 +73,18 @@ class BenchmarkResult:
     p95_response_time: float
     requests_per_second: float
     total_time: float
+    p75_response_time: float = 0.0
+    p90_response_time: float = 0.0
+    p99_response_time: float = 0.0
+    p999_response_time: float = 0.0
+    stddev_response_time: float = 0.0
+
 
+# Stand-in for a server that was skipped in a comparison (e.g. unhealthy)
+ZERO_RESULT = BenchmarkResult("", "", 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ComparisonResult:
     endpoint: str
     method: str
@@ -38,48 +96,118 @@ class ComparisonResult:
     nodejs_avg_ms: float
 
 
+class StreamingStats:
+    """Online latency accumulator for --streaming-stats mode
+
+    Mean and standard deviation use Welford's algorithm; percentiles come from
+    a microsecond-resolution histogram, so memory grows with the number of
+    distinct latencies rather than the number of requests. With hdrh installed
+    the histogram is a fixed-size HdrHistogram (1us..60s, 3 significant digits).
+    """
+
+    def __init__(self):
+        self.successful = 0
+        self.mean_ns = 0.0
+        self._m2 = 0.0
+        self.min_ns = 0
+        self.max_ns = 0
+        self._histogram_us: Counter = Counter()
+        self._hdr = HdrHistogram(1, 60_000_000, 3) if HdrHistogram else None
+
+    def add(self, elapsed_ns: int, status: int):
+        if not 200 <= status < 300:
+            # Failures are kept out of the latency distribution; the caller
+            # derives the failure count from the total number of requests
+            return
+        self.successful += 1
+        if self.successful == 1:
+            self.min_ns = self.max_ns = elapsed_ns
+        elif elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        elif elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        delta = elapsed_ns - self.mean_ns
+        self.mean_ns += delta / self.successful
+        self._m2 += delta * (elapsed_ns - self.mean_ns)
+        if self._hdr is not None:
+            # HdrHistogram's lowest trackable value is 1us
+            self._hdr.record_value(max(elapsed_ns // 1000, 1))
+        else:
+            self._histogram_us[elapsed_ns // 1000] += 1
+
+    @property
+    def stddev_ns(self) -> float:
+        return math.sqrt(self._m2 / self.successful) if self.successful else 0.0
+
+    def percentiles_ms(self, quantiles) -> List[float]:
+        """Nearest-rank percentiles (in ms) for ascending `quantiles`"""
+        if self._hdr is not None:
+            return [
+                self._hdr.get_value_at_percentile(q * 100) / 1000 for q in quantiles
+            ]
+        ranks = [int(self.successful * q) for q in quantiles]
+        values = []
+        seen = 0
+        for bucket_us in sorted(self._histogram_us):
+            seen += self._histogram_us[bucket_us]
+            while len(values) < len(ranks) and ranks[len(values)] < seen:
+                values.append(bucket_us / 1000)
+        return values
+
+
 class CRUDBenchmark:
     def __init__(
         self,
         fastapi_url: str = "http://localhost:8000",
         rust_url: str = "http://localhost:3000",
         nodejs_url: str = "http://localhost:4000",
+        concurrent_requests: int = 50,
+        connector_limit: Optional[int] = None,
+        warmup_requests: Optional[int] = None,
+        streaming_stats: bool = False,
+        parallel_targets: bool = False,
     ):
         self.fastapi_url = fastapi_url
         self.rust_url = rust_url
         self.nodejs_url = nodejs_url
+        self.concurrent_requests = concurrent_requests
+        self.connector_limit = connector_limit
+        self.warmup_requests = warmup_requests
+        self.streaming_stats = streaming_stats
+        self.parallel_targets = parallel_targets
         self.fastapi_results: List[BenchmarkResult] = []
         self.rust_results: List[BenchmarkResult] = []
         self.nodejs_results: List[BenchmarkResult] = []
         self.comparison_results: List[ComparisonResult] = []
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+
+    async def make_request(self, send) -> tuple:
+        """Make a single HTTP request and return response time (ns) and status
 
-    async def make_request(
-        self, session: aiohttp.ClientSession, method: str, url: str, data: dict = None
-    ) -> tuple:
-        """Make a single HTTP request and return response time and status"""
-        start_time = time.time()
+        `send` is a zero-argument callable with the verb, URL and body already
+        bound (see `benchmark_endpoint`). Status is -1 for timeouts and 0 for
+        other client/network errors.
+        """
+        start = time.perf_counter_ns()
         try:
-            if method.upper() == "GET":
-                async with session.get(url) as response:
-                    await response.text()
-                    return time.time() - start_time, response.status
-            elif method.upper() == "POST":
-                async with session.post(url, json=data) as response:
-                    await response.text()
-                    return time.time() - start_time, response.status
-            elif method.upper() == "PUT":
-                async with session.put(url, json=data) as response:
-                    await response.text()
-                    return time.time() - start_time, response.status
-            elif method.upper() == "DELETE":
-                async with session.delete(url) as response:
-                    await response.text()
-                    return time.time() - start_time, response.status
-        except Exception as e:
-            return time.time() - start_time, 0
+            async with send() as response:
+                # Drain without decoding; release() alone would close the
+                # keep-alive connection when the body is left unread. Large
+                # bodies are streamed so they are never buffered whole.
+                if (response.content_length or 0) > DRAIN_CHUNK_SIZE:
+                    async for _ in response.content.iter_chunked(DRAIN_CHUNK_SIZE):
+                        pass
+                else:
+                    await response.read()
+                return time.perf_counter_ns() - start, response.status
+        except asyncio.TimeoutError:
+            return time.perf_counter_ns() - start, -1
+        except aiohttp.ClientError:
+            return time.perf_counter_ns() - start, 0
 
     async def benchmark_endpoint(
         self,
+        session: aiohttp.ClientSession,
         base_url: str,
         endpoint: str,
         method: str,
@@ -93,34 +221,79 @@ class CRUDBenchmark:
         )
 
         url = f"{base_url}{endpoint}"
-        response_times = []
-        status_codes = []
-
-        # Create semaphore to limit concurrent requests
-        semaphore = asyncio.Semaphore(concurrent_requests)
-
-        async def limited_request(session):
-            async with semaphore:
-                return await self.make_request(session, method, url, data)
-
-        start_time = time.time()
+        verb = method.upper()
+        request_fn = getattr(session, HTTP_METHODS[verb])
+        if data is not None and verb in ("POST", "PUT"):
+            # Serialize the payload once rather than on every request
+            send = functools.partial(
+                request_fn,
+                url,
+                data=encode_json(data),
+                headers={"Content-Type": "application/json"},
+            )
+        else:
+            send = functools.partial(request_fn, url)
+
+        async def run_requests(count: int, stats: Optional[StreamingStats] = None):
+            # Latencies stay integer nanoseconds until the statistics pass; in
+            # streaming mode they go straight into the accumulator instead
+            buffer_size = count if stats is None else 0
+            response_times = np.empty(buffer_size, dtype=np.int64)
+            status_codes = np.empty(buffer_size, dtype=np.int16)
+
+            # A fixed pool of workers pulls request slots from a shared counter, so
+            # only `concurrent_requests` coroutines exist instead of one per request
+            next_index = itertools.count()
+
+            async def worker():
+                while (i := next(next_index)) < count:
+                    elapsed, status = await self.make_request(send)
+                    if stats is None:
+                        response_times[i] = elapsed
+                        status_codes[i] = status
+                    else:
+                        stats.add(elapsed, status)
 
-        # Create session and make requests
-        async with aiohttp.ClientSession() as session:
-            tasks = [limited_request(session) for _ in range(num_requests)]
-            results = await asyncio.gather(*tasks)
+            await asyncio.gather(
+                *(worker() for _ in range(min(concurrent_requests, count)))
+            )
+            return response_times, status_codes
+
+        # Warm up connections and server caches; these samples are discarded
+        warmup_requests = self.warmup_requests
+        if warmup_requests is None:
+            warmup_requests = max(concurrent_requests, 50)
+        # Writes are not warmed up: warm-up DELETEs would remove the item before
+        # the measured run, and warm-up POSTs would leave rows the cleanup
+        # doesn't reach, growing the table from run to run
+        if warmup_requests > 0 and verb not in WRITE_METHODS:
+            await run_requests(warmup_requests)
+
+        start_time = time.perf_counter()
+
+        # Reuse the shared session so keep-alive connections survive across endpoints
+        if self.streaming_stats:
+            stats = StreamingStats()
+            await run_requests(num_requests, stats)
+            total_time = time.perf_counter() - start_time
+            return self._streaming_result(
+                endpoint, method, num_requests, total_time, stats
+            )
 
-        total_time = time.time() - start_time
+        response_times, status_codes = await run_requests(num_requests)
 
-        # Process results
-        for response_time, status_code in results:
-            response_times.append(response_time)
-            status_codes.append(status_code)
+        total_time = time.perf_counter() - start_time
 
-        successful_requests = len([s for s in status_codes if 200 <= s < 300])
+        # Failed requests (non-2xx, timeouts, connection errors) are counted but
+        # kept out of the latency distribution so they don't skew the tail
+        ok = (status_codes >= 200) & (status_codes < 300)
+        successful_requests = int(ok.sum())
         failed_requests = num_requests - successful_requests
 
-        if not response_times:
+        # RPS counts every completed request, including failures, in every branch
+        requests_per_second = num_requests / total_time if total_time > 0 else 0
+
+        if successful_requests == 0:
             return BenchmarkResult(
                 endpoint,
                 method,
@@ -132,25 +305,24 @@ class CRUDBenchmark:
                 0,
                 0,
                 0,
-                0,
+                requests_per_second,
                 total_time,
             )
 
-        # Calculate statistics
-        avg_response_time = statistics.mean(response_times)
-        min_response_time = min(response_times)
-        max_response_time = max(response_times)
-        median_response_time = statistics.median(response_times)
-
-        # Handle edge case for p95 calculation
-        if len(response_times) > 1:
-            p95_response_time = statistics.quantiles(response_times, n=20)[
-                18
-            ]  # 95th percentile
-        else:
-            p95_response_time = response_times[0]
+        # Calculate statistics in one vectorized pass, converting ns to ms first
+        rt = response_times[ok] * 1e-6
+        avg_response_time = rt.mean()
+        min_response_time = rt.min()
+        max_response_time = rt.max()
+        stddev_response_time = rt.std()
 
-        requests_per_second = num_requests / total_time if total_time > 0 else 0
+        # Quickselect the order statistics we need instead of a full sort
+        k50, k75, k90, k95, k99, k999 = (
+            int(len(rt) * q) for q in (0.5, 0.75, 0.9, 0.95, 0.99, 0.999)
+        )
+        part = np.partition(rt, [k50, k75, k90, k95, k99, k999])
+        median_response_time = part[k50]
+        p95_response_time = part[k95]
 
         return BenchmarkResult(
             endpoint=endpoint,
@@ -158,31 +330,124 @@ class CRUDBenchmark:
             total_requests=num_requests,
             successful_requests=successful_requests,
             failed_requests=failed_requests,
-            avg_response_time=avg_response_time * 1000,  # Convert to ms
-            min_response_time=min_response_time * 1000,
-            max_response_time=max_response_time * 1000,
-            median_response_time=median_response_time * 1000,
-            p95_response_time=p95_response_time * 1000,
+            avg_response_time=float(avg_response_time),
+            min_response_time=float(min_response_time),
+            max_response_time=float(max_response_time),
+            median_response_time=float(median_response_time),
+            p95_response_time=float(p95_response_time),
             requests_per_second=requests_per_second,
             total_time=total_time,
+            p75_response_time=float(part[k75]),
+            p90_response_time=float(part[k90]),
+            p99_response_time=float(part[k99]),
+            p999_response_time=float(part[k999]),
+            stddev_response_time=float(stddev_response_time),
+        )
+
+    def _streaming_result(
+        self,
+        endpoint: str,
+        method: str,
+        num_requests: int,
+        total_time: float,
+        stats: StreamingStats,
+    ) -> BenchmarkResult:
+        """Build a BenchmarkResult from an online accumulator"""
+        requests_per_second = num_requests / total_time if total_time > 0 else 0
+        if not stats.successful:
+            return BenchmarkResult(
+                endpoint,
+                method,
+                num_requests,
+                0,
+                num_requests,
+                0,
+                0,
+                0,
+                0,
+                0,
+                requests_per_second,
+                total_time,
+            )
+
+        p50, p75, p90, p95, p99, p999 = stats.percentiles_ms(
+            (0.5, 0.75, 0.9, 0.95, 0.99, 0.999)
+        )
+        return BenchmarkResult(
+            endpoint=endpoint,
+            method=method,
+            total_requests=num_requests,
+            successful_requests=stats.successful,
+            failed_requests=num_requests - stats.successful,
+            avg_response_time=stats.mean_ns * 1e-6,
+            min_response_time=stats.min_ns * 1e-6,
+            max_response_time=stats.max_ns * 1e-6,
+            median_response_time=p50,
+            p95_response_time=p95,
+            requests_per_second=requests_per_second,
+            total_time=total_time,
+            p75_response_time=p75,
+            p90_response_time=p90,
+            p99_response_time=p99,
+            p999_response_time=p999,
+            stddev_response_time=stats.stddev_ns * 1e-6,
         )
 
     async def run_server_health_check(self, base_url: str, server_name: str) -> bool:
         """Check if server is running"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{base_url}/health", timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    if response.status == 200:
-                        print(f"✅ {server_name} server is running at {base_url}")
-                        return True
+            session = self._get_session(base_url)
+            async with session.get(
+                f"{base_url}/health", timeout=aiohttp.ClientTimeout(total=5)
+            ) as response:
+                await response.read()
+                if response.status == 200:
+                    print(f"✅ {server_name} server is running at {base_url}")
+                    return True
         except:
             pass
 
         print(f"❌ {server_name} server is not responding at {base_url}")
         return False
 
+    def _get_session(self, base_url: str) -> aiohttp.ClientSession:
+        """Return the long-lived session for a server, creating it on first use
+
+        One session per server keeps its connection pool and keep-alive
+        connections alive across health checks, every phase and cleanup.
+        """
+        session = self._sessions.get(base_url)
+        if session is None:
+            # aiohttp defaults to limit=100, which silently throttles high
+            # concurrency; size the pool from the configured concurrency instead.
+            # Each session talks to a single server, so limit_per_host is the cap
+            # that binds, and an explicit connector_limit overrides both.
+            limit = limit_per_host = self.connector_limit
+            if limit is None:
+                limit = max(self.concurrent_requests * 4, 1024)
+                limit_per_host = self.concurrent_requests * 2
+
+            connector = aiohttp.TCPConnector(
+                limit=limit,
+                limit_per_host=limit_per_host,
+                keepalive_timeout=75,
+                ttl_dns_cache=600,
+                use_dns_cache=True,
+                enable_cleanup_closed=True,
+            )
+            session = aiohttp.ClientSession(
+                connector=connector, json_serialize=dumps_json
+            )
+            self._sessions[base_url] = session
+        return session
+
+    async def aclose(self):
+        """Close every session opened by this benchmark"""
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for session in sessions:
+            await session.close()
+
     async def cleanup_databases(self, fastapi_healthy, rust_healthy, nodejs_healthy):
         """Clean up databases after benchmark to ensure consistent state"""
         print("\n🧹 CLEANUP: Resetting databases to initial state...")
@@ -216,40 +481,42 @@ class CRUDBenchmark:
     async def _cleanup_server_database(self, base_url: str, server_name: str):
         """Clean up database for a specific server"""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Delete all items except the original sample data (IDs 1, 2, 3)
-                # First, get all items to see what we have
-                async with session.get(f"{base_url}/db/items") as response:
-                    if response.status == 200:
-                        items = await response.json()
-                        items_to_delete = [
-                            item["id"] for item in items if item["id"] > 3
-                        ]
-
-                        print(
-                            f"🗑️ {server_name}: Deleting {len(items_to_delete)} benchmark items..."
-                        )
-
-                        # Delete items in batches to avoid overwhelming the server
-                        for item_id in items_to_delete[
-                            :50
-                        ]:  # Limit to avoid too many requests
-                            try:
-                                async with session.delete(
-                                    f"{base_url}/db/items/{item_id}"
-                                ) as del_response:
-                                    pass  # Don't need to process response
-                            except:
-                                pass  # Continue even if some deletions fail
-
-                        print(f"✅ {server_name}: Database cleanup completed")
-                    else:
-                        print(f"⚠️ {server_name}: Could not access database for cleanup")
+            session = self._get_session(base_url)
+            # Delete all items except the original sample data (IDs 1, 2, 3)
+            # First, get all items to see what we have
+            async with session.get(f"{base_url}/db/items") as response:
+                if response.status == 200:
+                    items = decode_json(await response.read())
+                    items_to_delete = [item["id"] for item in items if item["id"] > 3]
+
+                    print(
+                        f"🗑️ {server_name}: Deleting {len(items_to_delete)} benchmark items..."
+                    )
+
+                    async def delete_item(item_id):
+                        async with session.delete(
+                            f"{base_url}/db/items/{item_id}"
+                        ) as del_response:
+                            # Drain the body so the connection returns to
+                            # the pool instead of being closed
+                            await del_response.read()
+
+                    # Issue the deletes concurrently over the pooled connections;
+                    # failures are ignored so one bad delete doesn't stop the rest
+                    batch = items_to_delete[:50]  # Limit to avoid too many requests
+                    await asyncio.gather(
+                        *(delete_item(item_id) for item_id in batch),
+                        return_exceptions=True,
+                    )
+
+                    print(f"✅ {server_name}: Database cleanup completed")
+                else:
+                    print(f"⚠️ {server_name}: Could not access database for cleanup")
         except Exception as e:
             print(f"❌ {server_name}: Cleanup failed - {e}")
 
     async def run_crud_benchmark(
-        self, num_requests: int = 1000, concurrent_requests: int = 50
+        self, num_requests: int = 1000, concurrent_requests: Optional[int] = None
     ):
         """Run comprehensive CRUD benchmark with cleanup"""
         print(
@@ -257,28 +524,49 @@ class CRUDBenchmark:
         )
         print("=" * 90)
 
-        # Health checks
-        fastapi_healthy = await self.run_server_health_check(
-            self.fastapi_url, "FastAPI"
-        )
-        rust_healthy = await self.run_server_health_check(self.rust_url, "Rust Axum")
-        nodejs_healthy = await self.run_server_health_check(
-            self.nodejs_url, "Node.js TypeScript"
-        )
+        if concurrent_requests is None:
+            concurrent_requests = self.concurrent_requests
 
-        running_servers = sum([fastapi_healthy, rust_healthy, nodejs_healthy])
-        if running_servers == 0:
-            print(
-                "\n❌ No servers are running. Please start at least one server and try again."
-            )
-            return
-        elif running_servers < 3:
-            print(
-                f"\n⚠️ Only {running_servers}/3 servers are running. Continuing with available servers..."
+        try:
+            # Health checks (independent servers, so probe them concurrently)
+            fastapi_healthy, rust_healthy, nodejs_healthy = await asyncio.gather(
+                self.run_server_health_check(self.fastapi_url, "FastAPI"),
+                self.run_server_health_check(self.rust_url, "Rust Axum"),
+                self.run_server_health_check(self.nodejs_url, "Node.js TypeScript"),
             )
 
-        print("\n🔥 Starting comprehensive CRUD benchmark...\n")
+            running_servers = sum([fastapi_healthy, rust_healthy, nodejs_healthy])
+            if running_servers == 0:
+                print(
+                    "\n❌ No servers are running. Please start at least one server and try again."
+                )
+                return
+            elif running_servers < 3:
+                print(
+                    f"\n⚠️ Only {running_servers}/3 servers are running. Continuing with available servers..."
+                )
+
+            print("\n🔥 Starting comprehensive CRUD benchmark...\n")
 
+            await self._run_phases(
+                num_requests,
+                concurrent_requests,
+                fastapi_healthy,
+                rust_healthy,
+                nodejs_healthy,
+            )
+        finally:
+            await self.aclose()
+
+    async def _run_phases(
+        self,
+        num_requests,
+        concurrent_requests,
+        fastapi_healthy,
+        rust_healthy,
+        nodejs_healthy,
+    ):
+        """Run all benchmark phases, cleaning up databases afterwards"""
         try:
             # Phase 1: Basic endpoints
             basic_endpoints = [
@@ -406,7 +694,7 @@ class CRUDBenchmark:
             await self._run_endpoint_tests(
                 stress_endpoints,
                 num_requests // 2,
-                concurrent_requests // 2,
+                max(1, concurrent_requests // 2),  # --concurrent 1 still needs a worker
                 fastapi_healthy,
                 rust_healthy,
                 nodejs_healthy,
@@ -430,48 +718,17 @@ class CRUDBenchmark:
             print(f"\n📊 Testing: {description}")
             print("-" * 60)
 
-            results = {}
-
             # Test all available servers
-            if fastapi_healthy:
-                result = await self.benchmark_endpoint(
-                    self.fastapi_url,
-                    endpoint,
-                    method,
-                    num_requests,
-                    concurrent_requests,
-                    data,
-                )
-                self.fastapi_results.append(result)
-                results["fastapi"] = result
-
-            if rust_healthy:
-                result = await self.benchmark_endpoint(
-                    self.rust_url,
-                    endpoint,
-                    method,
-                    num_requests,
-                    concurrent_requests,
-                    data,
-                )
-                self.rust_results.append(result)
-                results["rust"] = result
-
-            if nodejs_healthy:
-                result = await self.benchmark_endpoint(
-                    self.nodejs_url,
-                    endpoint,
-                    method,
-                    num_requests,
-                    concurrent_requests,
-                    data,
-                )
-                self.nodejs_results.append(result)
-                results["nodejs"] = result
-
-            # Create comparison
-            if len(results) >= 2:
-                self._add_comparison(endpoint, method, results)
+            await self._benchmark_servers(
+                endpoint,
+                method,
+                data,
+                num_requests,
+                concurrent_requests,
+                fastapi_healthy,
+                rust_healthy,
+                nodejs_healthy,
+            )
 
     async def _test_crud_operation(
         self,
@@ -489,38 +746,62 @@ class CRUDBenchmark:
         print(f"\n📊 Testing: Database {operation_name}")
         print("-" * 60)
 
-        results = {}
-
-        if fastapi_healthy:
-            result = await self.benchmark_endpoint(
-                self.fastapi_url,
-                endpoint,
-                method,
-                num_requests,
-                concurrent_requests,
-                data,
-            )
-            self.fastapi_results.append(result)
-            results["fastapi"] = result
+        await self._benchmark_servers(
+            endpoint,
+            method,
+            data,
+            num_requests,
+            concurrent_requests,
+            fastapi_healthy,
+            rust_healthy,
+            nodejs_healthy,
+        )
 
-        if rust_healthy:
-            result = await self.benchmark_endpoint(
-                self.rust_url, endpoint, method, num_requests, concurrent_requests, data
+    async def _benchmark_servers(
+        self,
+        endpoint,
+        method,
+        data,
+        num_requests,
+        concurrent_requests,
+        fastapi_healthy,
+        rust_healthy,
+        nodejs_healthy,
+    ):
+        """Benchmark one endpoint on every healthy server and record a comparison"""
+        targets = [
+            (key, base_url, server_results)
+            for key, base_url, server_results, healthy in (
+                ("fastapi", self.fastapi_url, self.fastapi_results, fastapi_healthy),
+                ("rust", self.rust_url, self.rust_results, rust_healthy),
+                ("nodejs", self.nodejs_url, self.nodejs_results, nodejs_healthy),
             )
-            self.rust_results.append(result)
-            results["rust"] = result
+            if healthy
+        ]
 
-        if nodejs_healthy:
-            result = await self.benchmark_endpoint(
-                self.nodejs_url,
+        def run(base_url):
+            return self.benchmark_endpoint(
+                self._sessions[base_url],
+                base_url,
                 endpoint,
                 method,
                 num_requests,
                 concurrent_requests,
                 data,
             )
-            self.nodejs_results.append(result)
-            results["nodejs"] = result
+
+        if self.parallel_targets:
+            # Servers run side by side; faster, but they share the client CPU
+            async with asyncio.TaskGroup() as tg:
+                tasks = [tg.create_task(run(base_url)) for _, base_url, _ in targets]
+            target_results = [task.result() for task in tasks]
+        else:
+            target_results = [await run(base_url) for _, base_url, _ in targets]
+
+        results = {}
+        for (key, _, server_results), result in zip(targets, target_results):
+            server_results.append(result)
+            results[key] = result
 
         # Create comparison
         if len(results) >= 2:
@@ -528,27 +809,18 @@ class CRUDBenchmark:
 
     def _add_comparison(self, endpoint, method, results):
         """Helper method to add comparison results"""
+        fastapi = results.get("fastapi", ZERO_RESULT)
+        rust = results.get("rust", ZERO_RESULT)
+        nodejs = results.get("nodejs", ZERO_RESULT)
         comparison = ComparisonResult(
             endpoint=endpoint,
             method=method,
-            fastapi_rps=results.get(
-                "fastapi", BenchmarkResult("", "", 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-            ).requests_per_second,
-            rust_rps=results.get(
-                "rust", BenchmarkResult("", "", 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-            ).requests_per_second,
-            nodejs_rps=results.get(
-                "nodejs", BenchmarkResult("", "", 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-            ).requests_per_second,
-            fastapi_avg_ms=results.get(
-                "fastapi", BenchmarkResult("", "", 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-            ).avg_response_time,
-            rust_avg_ms=results.get(
-                "rust", BenchmarkResult("", "", 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-            ).avg_response_time,
-            nodejs_avg_ms=results.get(
-                "nodejs", BenchmarkResult("", "", 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
-            ).avg_response_time,
+            fastapi_rps=fastapi.requests_per_second,
+            rust_rps=rust.requests_per_second,
+            nodejs_rps=nodejs.requests_per_second,
+            fastapi_avg_ms=fastapi.avg_response_time,
+            rust_avg_ms=rust.avg_response_time,
+            nodejs_avg_ms=nodejs.avg_response_time,
         )
         self.comparison_results.append(comparison)
 
@@ -575,17 +847,20 @@ class CRUDBenchmark:
 
     def _print_server_results(self, results: List[BenchmarkResult]):
         """Print results for a single server"""
-        header = f"{'Endpoint':<25} {'Method':<8} {'RPS':<10} {'Avg(ms)':<10} {'P95(ms)':<10} {'Success':<10}"
-        print(header)
-        print("-" * len(header))
+        header = f"{'Endpoint':<25} {'Method':<8} {'RPS':<10} {'Avg(ms)':<10} {'P95(ms)':<10} {'P99(ms)':<10} {'Success':<10}"
+        # Build the whole table and write it once instead of one print per row
+        lines = [header, "-" * len(header)]
 
         for result in results:
             success_rate = f"{result.successful_requests}/{result.total_requests}"
-            print(
+            lines.append(
                 f"{result.endpoint:<25} {result.method:<8} {result.requests_per_second:<10.1f} "
-                f"{result.avg_response_time:<10.2f} {result.p95_response_time:<10.2f} {success_rate:<10}"
+                f"{result.avg_response_time:<10.2f} {result.p95_response_time:<10.2f} "
+                f"{result.p99_response_time:<10.2f} {success_rate:<10}"
             )
 
+        sys.stdout.write("\n".join(lines) + "\n")
+
     def print_comparison_summary(self):
         """Print a clear comparison summary with CRUD breakdown"""
         print("\n" + "=" * 100)
@@ -597,23 +872,10 @@ class CRUDBenchmark:
             return
 
         # Group results by operation type
-        basic_ops = []
-        read_ops = []
-        write_ops = []
-        stress_ops = []
-
-        for comp in self.comparison_results:
-            if comp.endpoint in ["/", "/health"] or "/echo" in comp.endpoint:
-                basic_ops.append(comp)
-            elif comp.method == "GET" and "/db/" in comp.endpoint:
-                read_ops.append(comp)
-            elif comp.method in ["POST", "PUT", "DELETE"] and "/db/" in comp.endpoint:
-                write_ops.append(comp)
-            elif "/stress/" in comp.endpoint:
-                stress_ops.append(comp)
-            else:
-                # Debug: print unmatched operations
-                print(f"⚠️ Unmatched operation: {comp.endpoint} ({comp.method})")
+        basic_ops, read_ops, write_ops, stress_ops, unmatched = self._group_operations()
+        for comp in unmatched:
+            # Debug: print unmatched operations
+            print(f"⚠️ Unmatched operation: {comp.endpoint} ({comp.method})")
 
         # Print comparison by operation type
         self._print_operation_comparison("🔧 Basic Operations", basic_ops)
@@ -679,7 +941,7 @@ class CRUDBenchmark:
 
         # CRUD-specific analysis
         if write_ops:
-            write_winner = self._get_category_winner(write_ops)
+            write_winner = category_winners["Database WRITE"]
             print(f"\n📝 CRUD Write Performance Leader: {write_winner}")
             print(
                 "   Write operations (CREATE, UPDATE, DELETE) are often bottlenecked by:"
@@ -689,66 +951,111 @@ class CRUDBenchmark:
             print("   • Data validation and serialization")
 
         if read_ops:
-            read_winner = self._get_category_winner(read_ops)
+            read_winner = category_winners["Database READ"]
             print(f"\n📖 CRUD Read Performance Leader: {read_winner}")
             print("   Read operations benefit from:")
             print("   • Efficient query execution")
             print("   • JSON serialization speed")
             print("   • Connection pooling strategies")
 
+    def _group_operations(self):
+        """Split comparison results into basic/read/write/stress/unmatched lists"""
+        basic_ops, read_ops, write_ops, stress_ops, unmatched = [], [], [], [], []
+
+        # One pass with hashed membership tests instead of a scan per group
+        for comp in self.comparison_results:
+            endpoint = comp.endpoint
+            if endpoint in BASIC_ENDPOINTS or "/echo" in endpoint:
+                basic_ops.append(comp)
+            elif "/db/" in endpoint and comp.method == "GET":
+                read_ops.append(comp)
+            elif "/db/" in endpoint and comp.method in WRITE_METHODS:
+                write_ops.append(comp)
+            elif "/stress/" in endpoint:
+                stress_ops.append(comp)
+            else:
+                unmatched.append(comp)
+
+        return basic_ops, read_ops, write_ops, stress_ops, unmatched
+
     def _print_operation_comparison(self, title, operations):
         """Print comparison for a specific operation type"""
         if not operations:
             return
 
-        print(f"\n{title}")
-        print("-" * 80)
-        print(
-            f"{'Endpoint':<20} {'Method':<8} {'FastAPI':<12} {'Rust':<12} {'Node.js':<12} {'Winner':<12}"
-        )
-        print("-" * 80)
-
-        for comp in operations:
-            # Determine winner for this endpoint
-            rps_values = [
-                ("FastAPI", comp.fastapi_rps),
-                ("Rust", comp.rust_rps),
-                ("Node.js", comp.nodejs_rps),
-            ]
-            rps_values = [(name, rps) for name, rps in rps_values if rps > 0]
+        lines = [
+            f"\n{title}",
+            "-" * 80,
+            f"{'Endpoint':<20} {'Method':<8} {'FastAPI':<12} {'Rust':<12} {'Node.js':<12} {'Winner':<12}",
+            "-" * 80,
+        ]
 
-            if rps_values:
-                winner = max(rps_values, key=lambda x: x[1])
-                winner_name = winner[0]
-            else:
-                winner_name = "N/A"
-
-            print(
+        for comp, winner in zip(operations, self._endpoint_winners(operations)):
+            winner_name = SERVER_NAMES[winner] if winner >= 0 else "N/A"
+            lines.append(
                 f"{comp.endpoint:<20} {comp.method:<8} "
                 f"{comp.fastapi_rps:<12.1f} {comp.rust_rps:<12.1f} "
                 f"{comp.nodejs_rps:<12.1f} {winner_name:<12}"
             )
 
+        sys.stdout.write("\n".join(lines) + "\n")
+
     def _get_category_winner(self, operations):
         """Determine the winner for a category of operations"""
         if not operations:
             return "N/A"
 
-        total_scores = {"FastAPI": 0, "Rust": 0, "Node.js": 0}
-
-        for comp in operations:
-            rps_values = [
-                ("FastAPI", comp.fastapi_rps),
-                ("Rust", comp.rust_rps),
-                ("Node.js", comp.nodejs_rps),
-            ]
-            rps_values = [(name, rps) for name, rps in rps_values if rps > 0]
-
-            if rps_values:
-                winner = max(rps_values, key=lambda x: x[1])
-                total_scores[winner[0]] += 1
-
-        return max(total_scores, key=total_scores.get)
+        winners = self._endpoint_winners(operations)
+        scores = np.bincount(winners[winners >= 0], minlength=len(SERVER_NAMES))
+        return SERVER_NAMES[int(scores.argmax())]
+
+    @staticmethod
+    def _endpoint_winners(operations) -> np.ndarray:
+        """Index into SERVER_NAMES of the fastest server per comparison
+
+        -1 marks comparisons where no server completed any requests.
+        """
+        rps = np.array(
+            [[c.fastapi_rps, c.rust_rps, c.nodejs_rps] for c in operations],
+            dtype=np.float64,
+        ).reshape(-1, len(SERVER_NAMES))
+        winners = rps.argmax(axis=1)
+        winners[rps.max(axis=1, initial=0.0) <= 0] = -1
+        return winners
+
+    @staticmethod
+    def _serialize_results(results: List[BenchmarkResult]) -> List[dict]:
+        """Flatten BenchmarkResults into the JSON report schema"""
+        # Success rates for the whole list in one vectorized divide
+        totals = np.fromiter(
+            (r.total_requests for r in results), dtype=np.float64, count=len(results)
+        )
+        successes = np.fromiter(
+            (r.successful_requests for r in results),
+            dtype=np.float64,
+            count=len(results),
+        )
+        success_rates = np.divide(
+            successes, totals, out=np.zeros_like(totals), where=totals > 0
+        ).tolist()
+
+        return [
+            {
+                "endpoint": r.endpoint,
+                "method": r.method,
+                "requests_per_second": r.requests_per_second,
+                "avg_response_time_ms": r.avg_response_time,
+                "median_response_time_ms": r.median_response_time,
+                "p75_response_time_ms": r.p75_response_time,
+                "p90_response_time_ms": r.p90_response_time,
+                "p95_response_time_ms": r.p95_response_time,
+                "p99_response_time_ms": r.p99_response_time,
+                "p999_response_time_ms": r.p999_response_time,
+                "stddev_response_time_ms": r.stddev_response_time,
+                "success_rate": success_rate,
+            }
+            for r, success_rate in zip(results, success_rates)
+        ]
 
     def save_comparison_results(
         self, filename: str = "comprehensive_crud_results.json"
@@ -757,62 +1064,24 @@ class CRUDBenchmark:
         results_data = {
             "timestamp": datetime.now().isoformat(),
             "benchmark_type": "Comprehensive CRUD Benchmark",
-            "fastapi_results": [
-                {
-                    "endpoint": r.endpoint,
-                    "method": r.method,
-                    "requests_per_second": r.requests_per_second,
-                    "avg_response_time_ms": r.avg_response_time,
-                    "p95_response_time_ms": r.p95_response_time,
-                    "success_rate": r.successful_requests / r.total_requests
-                    if r.total_requests > 0
-                    else 0,
-                }
-                for r in self.fastapi_results
-            ],
-            "rust_results": [
-                {
-                    "endpoint": r.endpoint,
-                    "method": r.method,
-                    "requests_per_second": r.requests_per_second,
-                    "avg_response_time_ms": r.avg_response_time,
-                    "p95_response_time_ms": r.p95_response_time,
-                    "success_rate": r.successful_requests / r.total_requests
-                    if r.total_requests > 0
-                    else 0,
-                }
-                for r in self.rust_results
-            ],
-            "nodejs_results": [
-                {
-                    "endpoint": r.endpoint,
-                    "method": r.method,
-                    "requests_per_second": r.requests_per_second,
-                    "avg_response_time_ms": r.avg_response_time,
-                    "p95_response_time_ms": r.p95_response_time,
-                    "success_rate": r.successful_requests / r.total_requests
-                    if r.total_requests > 0
-                    else 0,
-                }
-                for r in self.nodejs_results
-            ],
-            "comparisons": [
-                {
-                    "endpoint": c.endpoint,
-                    "method": c.method,
-                    "fastapi_rps": c.fastapi_rps,
-                    "rust_rps": c.rust_rps,
-                    "nodejs_rps": c.nodejs_rps,
-                    "fastapi_avg_ms": c.fastapi_avg_ms,
-                    "rust_avg_ms": c.rust_avg_ms,
-                    "nodejs_avg_ms": c.nodejs_avg_ms,
-                }
-                for c in self.comparison_results
-            ],
+            "fastapi_results": self._serialize_results(self.fastapi_results),
+            "rust_results": self._serialize_results(self.rust_results),
+            "nodejs_results": self._serialize_results(self.nodejs_results),
+            # ComparisonResult fields already match the report schema
+            "comparisons": self.comparison_results,
         }
 
-        with open(filename, "w") as f:
-            json.dump(results_data, f, indent=2)
+        if orjson is not None:
+            with open(filename, "wb") as f:
+                f.write(
+                    orjson.dumps(
+                        results_data,
+                        option=orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_INDENT_2,
+                    )
+                )
+        else:
+            with open(filename, "w") as f:
+                json.dump(results_data, f, indent=2, default=dataclasses.asdict)
         print(f"\n💾 Comprehensive CRUD results saved to {filename}")
 
     def create_performance_chart(
@@ -820,32 +1089,18 @@ class CRUDBenchmark:
     ):
         """Create a visual comparison chart for CRUD operations"""
         try:
+            import matplotlib
+
+            # Headless backend: avoids initializing a GUI toolkit for a CLI run
+            matplotlib.use("Agg")
             import matplotlib.pyplot as plt
-            import numpy as np
 
             if not self.comparison_results:
                 print("No data available for chart generation.")
                 return
 
             # Group results by operation type for cleaner visualization
-            basic_ops = [
-                c
-                for c in self.comparison_results
-                if c.endpoint in ["/", "/health"] or "/echo" in c.endpoint
-            ]
-            read_ops = [
-                c
-                for c in self.comparison_results
-                if c.method == "GET" and "/db/" in c.endpoint
-            ]
-            write_ops = [
-                c
-                for c in self.comparison_results
-                if c.method in ["POST", "PUT", "DELETE"] and "/db/" in c.endpoint
-            ]
-            stress_ops = [
-                c for c in self.comparison_results if "/stress/" in c.endpoint
-            ]
+            basic_ops, read_ops, write_ops, stress_ops, _ = self._group_operations()
 
             # Create a 2x3 grid to accommodate 5 charts
             fig, ((ax1, ax2, ax3), (ax4, ax5, ax6)) = plt.subplots(
@@ -941,85 +1196,71 @@ class CRUDBenchmark:
             ax6.axis("off")
 
             plt.tight_layout()
-            plt.savefig(filename, dpi=300, bbox_inches="tight")
+            # tight_layout already fits the figure; bbox_inches="tight" would
+            # force a second render to measure it
+            fig.savefig(filename, dpi=150)
+            plt.close(fig)
             print(f"📊 Comprehensive CRUD chart with stress tests saved to {filename}")
 
-        except ImportError as e:
-            missing_package = (
-                "matplotlib"
-                if "matplotlib" in str(e)
-                else "numpy"
-                if "numpy" in str(e)
-                else "unknown package"
-            )
+        except ImportError:
             print(
-                f"📊 {missing_package} not available. Install it with: pipenv install matplotlib numpy"
+                "📊 matplotlib not available. Install it with: pipenv install matplotlib"
             )
         except Exception as e:
             print(f"Error creating chart: {e}")
 
     def _plot_operation_comparison(self, ax, operations, title, metric_type):
         """Helper method to plot operation comparisons"""
+        from matplotlib.patches import Patch
+
         if not operations:
             return
 
         endpoints = [f"{op.endpoint}\n({op.method})" for op in operations]
 
         if metric_type == "rps":
-            fastapi_values = [op.fastapi_rps for op in operations]
-            rust_values = [op.rust_rps for op in operations]
-            nodejs_values = [op.nodejs_rps for op in operations]
+            get_values = operator.attrgetter("fastapi_rps", "rust_rps", "nodejs_rps")
             ylabel = "Requests per Second"
         else:  # latency
-            fastapi_values = [op.fastapi_avg_ms for op in operations]
-            rust_values = [op.rust_avg_ms for op in operations]
-            nodejs_values = [op.nodejs_avg_ms for op in operations]
+            get_values = operator.attrgetter(
+                "fastapi_avg_ms", "rust_avg_ms", "nodejs_avg_ms"
+            )
             ylabel = "Average Response Time (ms)"
 
-        # Use range instead of numpy.arange to avoid numpy dependency issues
-        x = list(range(len(endpoints)))
+        x = np.arange(len(endpoints))
         width = 0.25
+        labels = ["FastAPI", "Rust Axum", "Node.js TypeScript"]
+        colors = ["#3776ab", "#dea584", "#339933"]
 
-        # Calculate bar positions manually
-        fastapi_positions = [i - width for i in x]
-        rust_positions = x
-        nodejs_positions = [i + width for i in x]
-
+        # Draw every series in one bar() call: broadcast the per-server offsets
+        # over the endpoint positions and colour each bar by its server
+        values = np.array([get_values(op) for op in operations], dtype=np.float64)
+        positions = x[:, None] + np.array([-width, 0.0, width])
         ax.bar(
-            fastapi_positions,
-            fastapi_values,
+            positions.ravel(),
+            values.ravel(),
             width,
-            label="FastAPI",
-            color="#3776ab",
-            alpha=0.8,
-        )
-        ax.bar(
-            rust_positions,
-            rust_values,
-            width,
-            label="Rust Axum",
-            color="#dea584",
-            alpha=0.8,
-        )
-        ax.bar(
-            nodejs_positions,
-            nodejs_values,
-            width,
-            label="Node.js TypeScript",
-            color="#339933",
+            color=colors * len(endpoints),
             alpha=0.8,
         )
+        legend_handles = [
+            Patch(facecolor=color, alpha=0.8, label=label)
+            for label, color in zip(labels, colors)
+        ]
 
         ax.set_xlabel("Endpoints")
         ax.set_ylabel(ylabel)
         ax.set_title(title)
         ax.set_xticks(x)
         ax.set_xticklabels(endpoints, rotation=45, ha="right", fontsize=8)
-        ax.legend()
+        ax.legend(handles=legend_handles)
         ax.grid(True, alpha=0.3)
 
 
 async def main():
+    # Only the CLI needs argparse; keep it off the import path for library use
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Comprehensive CRUD Benchmark: FastAPI vs Rust Axum vs Node.js TypeScript"
     )
@@ -1050,6 +1291,32 @@ async def main():
         default=50,
         help="Number of concurrent requests (default: 50)",
     )
+    parser.add_argument(
+        "--connector-limit",
+        type=int,
+        default=None,
+        help="Connection pool size per server, 0 for unlimited "
+        "(default: 2 x concurrent)",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=None,
+        help="Discarded warm-up requests before each measured read run; write "
+        "endpoints are not warmed up (default: max(concurrent, 50))",
+    )
+    parser.add_argument(
+        "--streaming-stats",
+        action="store_true",
+        help="Aggregate latencies online instead of keeping every sample "
+        "(percentiles at microsecond resolution)",
+    )
+    parser.add_argument(
+        "--parallel-targets",
+        action="store_true",
+        help="Benchmark all servers concurrently instead of one after another "
+        "(faster, but the servers compete for client and host resources)",
+    )
     parser.add_argument(
         "--output",
         default="comprehensive_crud_results.json",
@@ -1063,10 +1330,19 @@ async def main():
 
     args = parser.parse_args()
 
-    benchmark = CRUDBenchmark(args.fastapi_url, args.rust_url, args.nodejs_url)
+    benchmark = CRUDBenchmark(
+        args.fastapi_url,
+        args.rust_url,
+        args.nodejs_url,
+        concurrent_requests=args.concurrent,
+        connector_limit=args.connector_limit,
+        warmup_requests=args.warmup,
+        streaming_stats=args.streaming_stats,
+        parallel_targets=args.parallel_targets,
+    )
 
     try:
-        await benchmark.run_crud_benchmark(args.requests, args.concurrent)
+        await benchmark.run_crud_benchmark(args.requests)
         benchmark.print_detailed_results()
         benchmark.print_comparison_summary()
         benchmark.save_comparison_results(args.output)
@@ -1094,4 +1370,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is optional (unavailable on Windows); fall back to the default loop
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -10,9 +10,8 @@ use serde::{Deserialize, Serialize};
 use sqlx::sqlite::SqlitePool;
 use std::{
     collections::HashMap,
-    time::{Duration, Instant},
+    time::Instant,
 };
-use tokio::time::sleep;
 use tower::ServiceBuilder;
 use tower_http::cors::CorsLayer;
 
@@ -197,7 +196,6 @@ pub async fn health_check(State(state): State<AppState>) -> Json<HealthResponse>
 
 pub async fn echo_post(Json(payload): Json<EchoRequest>) -> Json<EchoResponse> {
     let start = Instant::now();
-    sleep(Duration::from_millis(1)).await;
     let processing_time = start.elapsed().as_secs_f64() * 1000.0;
     
     Json(EchoResponse {
@@ -210,7 +208,6 @@ pub async fn echo_post(Json(payload): Json<EchoRequest>) -> Json<EchoResponse> {
 
 pub async fn echo_get(Path(message): Path<String>) -> Json<serde_json::Value> {
     let start = Instant::now();
-    sleep(Duration::from_millis(1)).await;
     let processing_time = start.elapsed().as_secs_f64() * 1000.0;
     
     Json(serde_json::json!({
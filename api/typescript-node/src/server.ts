@@ -143,10 +143,6 @@ const getCurrentTimestamp = (): string => {
   return new Date().toISOString();
 };
 
-const sleep = (ms: number): Promise<void> => {
-  return new Promise(resolve => setTimeout(resolve, ms));
-};
-
 // Express app setup
 const app = express();
 const PORT = process.env.PORT || 4000;
@@ -203,9 +199,6 @@ app.post('/echo', async (req: Request, res: Response) => {
   const startTime = process.hrtime.bigint();
   const echoRequest: EchoRequest = req.body;
 
-  // Simulate some processing time
-  await sleep(1);
-
   const endTime = process.hrtime.bigint();
   const processingTime = Number(endTime - startTime) / 1000000;
 
@@ -223,8 +216,6 @@ app.get('/echo/:message', async (req: Request, res: Response) => {
   const startTime = process.hrtime.bigint();
   const message = req.params.message;
 
-  await sleep(1);
-
   const endTime = process.hrtime.bigint();
   const processingTime = Number(endTime - startTime) / 1000000;
 